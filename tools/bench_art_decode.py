@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Compare the old album art path (decode at full resolution, then
+# scale_simple) with decode_album_art(), which streams chunks into a
+# PixbufLoader sized at the display size.
+#
+#   python3 tools/bench_art_decode.py [image.jpg ...] [--scale 2] [--rounds 20]
+#
+# Without images, JPEG covers at typical Spotify sizes are generated first.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import bluedia
+from bluedia import GdkPixbuf, GLib, ALBUM_ART_SIZE, ART_CHUNK_SIZE, decode_album_art
+
+SAMPLE_SIZES = (300, 640, 1000, 1400, 3000)
+
+def make_samples(directory):
+    paths = []
+    for size in SAMPLE_SIZES:
+        # Rotated noise rows compress like a real photo, unlike a flat fill.
+        noise = os.urandom(size * 3)
+        data = b"".join(
+            noise[(y * 7) % len(noise):] + noise[:(y * 7) % len(noise)] for y in range(size)
+        )
+        pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
+            GLib.Bytes.new(data), GdkPixbuf.Colorspace.RGB, False, 8, size, size, size * 3
+        )
+        path = os.path.join(directory, f"cover-{size}.jpg")
+        pixbuf.savev(path, "jpeg", ["quality"], ["90"])
+        paths.append(path)
+    return paths
+
+def old_path(data, size):
+    loader = GdkPixbuf.PixbufLoader()
+    loader.write(data)
+    loader.close()
+    pixbuf = loader.get_pixbuf()
+    decoded_bytes = pixbuf.get_byte_length()
+    return pixbuf.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR), decoded_bytes
+
+def new_path(data, size):
+    chunks = (data[i:i + ART_CHUNK_SIZE] for i in range(0, len(data), ART_CHUNK_SIZE))
+    pixbuf = decode_album_art(chunks, size)
+    return pixbuf, pixbuf.get_byte_length()
+
+def measure(function, data, size, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _, decoded_bytes = function(data, size)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), decoded_bytes
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--scale", type=int, default=1, help="window scale factor")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        images = args.images or make_samples(directory)
+        size = ALBUM_ART_SIZE * args.scale
+        print(f"target {size}x{size}, median of {args.rounds} rounds")
+        print(f"{'image':<24}{'old ms':>10}{'new ms':>10}{'speedup':>10}{'old peak KiB':>14}{'new peak KiB':>14}")
+        for path in images:
+            with open(path, "rb") as file:
+                data = file.read()
+            old_time, old_bytes = measure(old_path, data, size, args.rounds)
+            new_time, new_bytes = measure(new_path, data, size, args.rounds)
+            print(
+                f"{os.path.basename(path):<24}{old_time * 1000:>10.2f}{new_time * 1000:>10.2f}"
+                f"{old_time / new_time:>9.1f}x{old_bytes / 1024:>14.0f}{new_bytes / 1024:>14.0f}"
+            )
+    bluedia.bluetooth_session.close()
+
+if __name__ == "__main__":
+    main()
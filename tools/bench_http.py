@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# Compare bare requests.get/post (the old behaviour) with bluedia's shared
+# HttpClient against the local Spotify stand-in: one token, search and image
+# fetch per simulated track change.
+#
+#   python3 tools/bench_http.py [--tracks 50] [--delay 0.02]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import requests
+
+import bluedia
+from spotify_standin import SpotifyStandin
+
+def track_change(get, post, base, index):
+    post(f"{base}/api/token", data={"grant_type": "client_credentials"})
+    response = get(f"{base}/v1/search?q=track{index % 10}&type=track")
+    image_url = response.json()["tracks"]["items"][0]["album"]["images"][0]["url"]
+    return len(get(image_url).content)
+
+def run(name, get, post, tracks, delay):
+    server = SpotifyStandin(delay=delay).start()
+    start = time.perf_counter()
+    received = sum(track_change(get, post, server.url, index) for index in range(tracks))
+    elapsed = time.perf_counter() - start
+    server.stop()
+    requests_made = sum(server.counters.get(name, 0) for name in ("token", "search", "image"))
+    print(
+        f"{name:<12}{elapsed * 1000 / tracks:>12.2f}{requests_made:>10}"
+        f"{server.counters.get('connections', 0):>13}{server.counters.get('not_modified', 0):>8}"
+        f"{received / 1024:>12.0f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tracks", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.0, help="server delay per response in seconds")
+    args = parser.parse_args()
+
+    print(f"{'client':<12}{'ms/track':>12}{'requests':>10}{'connections':>13}{'304s':>8}{'KiB':>12}")
+    run("requests", requests.get, requests.post, args.tracks, args.delay)
+    client = bluedia.HttpClient()
+    run("HttpClient", lambda url, **kw: client.get(url, revalidate="/v1/search" in url, **kw),
+        client.post, args.tracks, args.delay)
+    for host, stats in client.stats().items():
+        print(host, stats)
+    bluedia.bluetooth_session.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Run the original substring-matching parser and PlayerProperties.apply()
+# over the sample bluetoothctl outputs in tools/corpus/ and compare timings.
+#
+#   python3 tools/bench_parser.py [--rounds 20000] [--show]
+#
+# The corpus holds show dumps and [CHG] streams in the formats printed by
+# several BlueZ releases (5.50 without the "Track." prefix, 5.64, 5.72).
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import bluedia
+from bluedia import ANSI_ESCAPE_RE, PlayerProperties
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# parse_track_details() and the shuffle/repeat scans as they were before the
+# single-pass parser, kept here as the baseline.
+def legacy_parse(output):
+    track_details = {}
+    for line in output.split("\n"):
+        if "Track.Title" in line:
+            track_details["Title"] = line.split(":")[-1].strip()
+        elif "Track.Artist" in line:
+            track_details["Artist"] = line.split(":")[-1].strip()
+        elif "Track.Album" in line:
+            track_details["Album"] = line.split(":")[-1].strip()
+        elif "Status" in line:
+            track_details["Status"] = line.split(":")[-1].strip()
+        elif "Track.Duration" in line:
+            try:
+                track_details["Duration"] = int(line.split("(")[1].split(")")[0])
+            except (ValueError, IndexError):
+                track_details["Duration"] = 0
+        elif "Position" in line:
+            try:
+                track_details["Position"] = int(line.split("(")[1].split(")")[0])
+            except (ValueError, IndexError):
+                track_details["Position"] = 0
+    track_details["Shuffle"] = "alltracks" if "Shuffle: alltracks" in output else "off"
+    repeat_mode = "off"
+    if "Repeat: alltracks" in output:
+        repeat_mode = "alltracks"
+    elif "Repeat: singletrack" in output:
+        repeat_mode = "singletrack"
+    track_details["Repeat"] = repeat_mode
+    return track_details
+
+def structured_parse(output):
+    record = PlayerProperties()
+    record.apply(output)
+    return record
+
+def measure(function, output, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function(output)
+    return (time.perf_counter() - start) / rounds
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--show", action="store_true", help="print what each parser extracted")
+    args = parser.parse_args()
+
+    print(f"{'sample':<30}{'legacy us':>12}{'new us':>10}{'speedup':>10}")
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.txt"))):
+        with open(path) as file:
+            # The session strips colour codes before anything is parsed.
+            output = ANSI_ESCAPE_RE.sub("", file.read())
+        legacy = measure(legacy_parse, output, args.rounds)
+        new = measure(structured_parse, output, args.rounds)
+        print(f"{os.path.basename(path):<30}{legacy * 1e6:>12.2f}{new * 1e6:>10.2f}{legacy / new:>9.1f}x")
+        if args.show:
+            record = structured_parse(output)
+            print("  legacy:", legacy_parse(output))
+            print("  new:   ", {name: getattr(record, name) for name in PlayerProperties.__slots__})
+    bluedia.bluetooth_session.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# Time the `bluedia <command>` remote control path from process start to
+# exit, and check which modules it pulls in. For comparison, the same is
+# measured for a plain import of the module as the window path does it.
+#
+#   python3 tools/bench_remote.py [--command status] [--rounds 20]
+#
+# Without a running instance the command fails fast with "not running";
+# the timing is still representative since the D-Bus round trip is cheap.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SCRIPT = os.path.join(SRC_DIR, "bluedia.py")
+# Modules the remote path must not load.
+HEAVY_MODULES = ("gi.repository.Gtk", "gi.repository.Gdk", "gi.repository.GdkPixbuf", "requests")
+
+def run(argv):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime"] + argv, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            imported.add(line.rsplit("|", 1)[1].strip())
+    return elapsed, imported
+
+def measure(name, argv, rounds):
+    timings = []
+    for _ in range(rounds):
+        elapsed, imported = run(argv)
+        timings.append(elapsed)
+    heavy = sorted(module for module in imported if module.startswith(HEAVY_MODULES))
+    print(f"{name:<16}{statistics.median(timings) * 1000:>10.1f}{min(timings) * 1000:>10.1f}   {', '.join(heavy) or '-'}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--command", default="status", choices=("next", "prev", "toggle", "status"))
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'path':<16}{'median ms':>10}{'min ms':>10}   heavy modules imported")
+    measure(f"remote {args.command}", [SCRIPT, args.command], args.rounds)
+    measure("window imports", ["-c", f"import sys; sys.path.insert(0, {SRC_DIR!r}); import bluedia"], args.rounds)
+
+if __name__ == "__main__":
+    main()
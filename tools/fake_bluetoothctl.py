@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Scripted bluetoothctl for tools/replay_bench.py. It replays the show dumps
+# in tools/corpus/ as a playlist on one player and answers the commands
+# bluedia sends. On a track change the next reply is preceded by one of the
+# recorded [CHG] streams, the way a live session interleaves them.
+#
+#   FAKE_BLUETOOTHCTL_STATE    JSON file holding the playlist index and the
+#                              status; the harness edits it to change track
+#                              "on the phone" (required)
+#   FAKE_BLUETOOTHCTL_LATENCY  seconds to wait before answering a command
+#   FAKE_BLUETOOTHCTL_LOG      gets one line per spawn and per command
+#
+# Unknown commands get "Invalid command in menu player: ...", which is what
+# bluedia's session uses to find the end of a reply.
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+PLAYER_PATH = "/org/bluez/hci0/dev_A4_C6_9E_12_34_56/player0"
+PLAYER_PATH_RE = re.compile(r"/org/bluez/hci\d+/dev_[0-9A-F_]+/player\d+")
+VERSION = "5.72"
+
+# The show dumps, moved onto PLAYER_PATH, in file name order.
+def load_playlist():
+    playlist = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*-show.txt"))):
+        with open(path) as file:
+            playlist.append(PLAYER_PATH_RE.sub(PLAYER_PATH, file.read()))
+    return playlist
+
+def load_chg_streams():
+    streams = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*-chg-stream.txt"))):
+        with open(path) as file:
+            streams.append(PLAYER_PATH_RE.sub(PLAYER_PATH, file.read()))
+    return streams
+
+def read_state(path):
+    with open(path) as file:
+        return json.load(file)
+
+def append_log(path, line):
+    if path:
+        with open(path, "a") as file:
+            file.write(f"{time.monotonic():.6f} {os.getpid()} {line}\n")
+
+def write_state(path, state):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, path)
+
+class FakeBluetoothctl:
+    def __init__(self, state_path, latency=0.0, log_path=None):
+        self.state_path = state_path
+        self.latency = latency
+        self.log_path = log_path
+        self.playlist = load_playlist()
+        self.chg_streams = load_chg_streams()
+        self.reported_index = None
+        self.changes = 0
+
+    def log(self, line):
+        append_log(self.log_path, line)
+
+    def show(self, state):
+        text = self.playlist[state["index"] % len(self.playlist)]
+        return re.sub(r"(?m)^(\s+Status: ).*$", lambda m: m.group(1) + state["status"], text, count=1)
+
+    def answer(self, command):
+        words = command.split()
+        name = words[0] if words else ""
+        state = read_state(self.state_path)
+        if name in ("next", "previous"):
+            state["index"] += 1 if name == "next" else -1
+            write_state(self.state_path, state)
+            return f"Attempting to {name}\n"
+        if name in ("play", "pause"):
+            state["status"] = "playing" if name == "play" else "paused"
+            write_state(self.state_path, state)
+            return f"Attempting to {name}\n"
+        if name in ("shuffle", "repeat"):
+            return f"Attempting to set {name}\n"
+        if name == "select":
+            return ""
+        if name == "menu":
+            return "Menu player:\nAvailable commands:\n-------------------\n"
+        if name == "list":
+            return f"Player {PLAYER_PATH} [default]\n"
+        if name == "show":
+            prefix = ""
+            if self.reported_index is not None and state["index"] != self.reported_index and self.chg_streams:
+                prefix = self.chg_streams[self.changes % len(self.chg_streams)]
+                self.changes += 1
+            self.reported_index = state["index"]
+            return prefix + self.show(state)
+        return None
+
+    def serve(self):
+        self.log("spawn")
+        sys.stdout.write("Agent registered\n")
+        sys.stdout.flush()
+        for line in sys.stdin:
+            command = line.strip()
+            if command in ("quit", "exit"):
+                break
+            if not command:
+                continue
+            reply = self.answer(command)
+            if reply is None:
+                reply = f"Invalid command in menu player: {command}\n"
+            else:
+                self.log(f"command {command}")
+                if self.latency:
+                    time.sleep(self.latency)
+            sys.stdout.write(reply)
+            sys.stdout.flush()
+
+def main():
+    if "--version" in sys.argv[1:]:
+        append_log(os.environ.get("FAKE_BLUETOOTHCTL_LOG"), "spawn --version")
+        print(f"bluetoothctl: {VERSION}")
+        return
+    FakeBluetoothctl(
+        os.environ["FAKE_BLUETOOTHCTL_STATE"],
+        float(os.environ.get("FAKE_BLUETOOTHCTL_LATENCY", 0)),
+        os.environ.get("FAKE_BLUETOOTHCTL_LOG"),
+    ).serve()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# Stand-in for BlueZ exposing one org.bluez.MediaPlayer1 on a private bus.
+#
+#   eval $(dbus-daemon --session --fork --print-address=1 | sed 's/^/export DBUS_SYSTEM_BUS_ADDRESS=/')
+#   python3 tools/mock_mediaplayer.py [--players 2] &
+#   python3 src/bluedia.py
+#
+# Play/Pause/Next/Previous and Shuffle/Repeat writes emit PropertiesChanged
+# just like BlueZ does, so the D-Bus backend can be exercised without a phone.
+# With --players, several devices each expose a player, for the switcher.
+import argparse
+
+import gi
+gi.require_version("Gio", "2.0")
+
+from gi.repository import Gio, GLib
+
+PLAYER_PATH = "/org/bluez/hci0/dev_00_11_22_33_44_{:02X}/player0"
+PLAYER_NAMES = ["Mock Player", "Mock Tablet", "Mock Laptop"]
+MEDIA_PLAYER_INTERFACE = "org.bluez.MediaPlayer1"
+
+INTROSPECTION_XML = """
+<node>
+  <interface name="org.freedesktop.DBus.ObjectManager">
+    <method name="GetManagedObjects">
+      <arg name="objects" type="a{oa{sa{sv}}}" direction="out"/>
+    </method>
+    <signal name="InterfacesAdded">
+      <arg name="object" type="o"/>
+      <arg name="interfaces" type="a{sa{sv}}"/>
+    </signal>
+    <signal name="InterfacesRemoved">
+      <arg name="object" type="o"/>
+      <arg name="interfaces" type="as"/>
+    </signal>
+  </interface>
+  <interface name="org.bluez.MediaPlayer1">
+    <method name="Play"/>
+    <method name="Pause"/>
+    <method name="Stop"/>
+    <method name="Next"/>
+    <method name="Previous"/>
+    <property name="Status" type="s" access="read"/>
+    <property name="Position" type="u" access="read"/>
+    <property name="Track" type="a{sv}" access="read"/>
+    <property name="Shuffle" type="s" access="readwrite"/>
+    <property name="Repeat" type="s" access="readwrite"/>
+    <property name="Name" type="s" access="read"/>
+  </interface>
+</node>
+"""
+
+TRACKS = [
+    {"Title": "Harder, Better, Faster, Stronger", "Artist": "Daft Punk", "Album": "Discovery", "Duration": 224000},
+    {"Title": "Midnight City", "Artist": "M83", "Album": "Hurry Up, We're Dreaming", "Duration": 243000},
+    {"Title": "Strobe", "Artist": "deadmau5", "Album": "For Lack of a Better Name", "Duration": 634000},
+]
+
+class MockPlayer:
+    def __init__(self, connection, index):
+        self.connection = connection
+        self.path = PLAYER_PATH.format(0x55 + index)
+        self.name = PLAYER_NAMES[index % len(PLAYER_NAMES)]
+        self.track_index = index % len(TRACKS)
+        self.status = "paused"
+        self.position = 0
+        self.shuffle = "off"
+        self.repeat = "off"
+        node = Gio.DBusNodeInfo.new_for_xml(INTROSPECTION_XML)
+        connection.register_object(
+            self.path, node.lookup_interface(MEDIA_PLAYER_INTERFACE),
+            self.on_method_call, self.on_get_property, self.on_set_property
+        )
+
+    def properties(self):
+        track = TRACKS[self.track_index]
+        return {
+            "Status": GLib.Variant("s", self.status),
+            "Position": GLib.Variant("u", self.position),
+            "Track": GLib.Variant("a{sv}", {
+                "Title": GLib.Variant("s", track["Title"]),
+                "Artist": GLib.Variant("s", track["Artist"]),
+                "Album": GLib.Variant("s", track["Album"]),
+                "Duration": GLib.Variant("u", track["Duration"]),
+            }),
+            "Shuffle": GLib.Variant("s", self.shuffle),
+            "Repeat": GLib.Variant("s", self.repeat),
+            "Name": GLib.Variant("s", self.name),
+        }
+
+    def emit_changed(self, *names):
+        properties = self.properties()
+        self.connection.emit_signal(
+            None, self.path, "org.freedesktop.DBus.Properties", "PropertiesChanged",
+            GLib.Variant("(sa{sv}as)", (MEDIA_PLAYER_INTERFACE, {name: properties[name] for name in names}, []))
+        )
+
+    def change_track(self, step):
+        self.track_index = (self.track_index + step) % len(TRACKS)
+        self.position = 0
+        self.emit_changed("Track", "Position")
+
+    def on_method_call(self, connection, sender, path, interface, method, parameters, invocation):
+        print(f"mock: {self.name}: {interface}.{method}")
+        if method == "Play":
+            self.status = "playing"
+            self.emit_changed("Status")
+        elif method in ("Pause", "Stop"):
+            self.status = "paused" if method == "Pause" else "stopped"
+            self.emit_changed("Status")
+        elif method == "Next":
+            self.change_track(1)
+        elif method == "Previous":
+            self.change_track(-1)
+        invocation.return_value(None)
+
+    def on_get_property(self, connection, sender, path, interface, name):
+        return self.properties()[name]
+
+    def on_set_property(self, connection, sender, path, interface, name, value):
+        setattr(self, name.lower(), value.unpack())
+        self.emit_changed(name)
+        return True
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=1)
+    args = parser.parse_args()
+    loop = GLib.MainLoop()
+    players = []
+
+    def on_manager_call(connection, sender, path, interface, method, parameters, invocation):
+        objects = {player.path: {MEDIA_PLAYER_INTERFACE: player.properties()} for player in players}
+        invocation.return_value(GLib.Variant("(a{oa{sa{sv}}})", (objects,)))
+
+    def on_bus_acquired(connection, name):
+        node = Gio.DBusNodeInfo.new_for_xml(INTROSPECTION_XML)
+        connection.register_object(
+            "/", node.lookup_interface("org.freedesktop.DBus.ObjectManager"), on_manager_call, None, None
+        )
+        players.extend(MockPlayer(connection, index) for index in range(args.players))
+
+    def on_name_lost(connection, name):
+        print("mock: could not own org.bluez, is DBUS_SYSTEM_BUS_ADDRESS set?")
+        loop.quit()
+
+    Gio.bus_own_name(
+        Gio.BusType.SYSTEM, "org.bluez", Gio.BusNameOwnerFlags.NONE,
+        on_bus_acquired, None, on_name_lost
+    )
+    loop.run()
+
+if __name__ == "__main__":
+    main()
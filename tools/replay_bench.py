@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# Drive BluetoothControlWindow through scripted sessions against
+# tools/fake_bluetoothctl.py (put on PATH as `bluetoothctl`) and the Spotify
+# stand-in, and report click-to-UI latency, subprocess and HTTP request
+# counts, main loop stalls and RSS. Everything runs offline and starts from
+# empty caches, so runs are comparable between changes.
+#
+#   python3 tools/replay_bench.py [--session skip] [--latency 0.02]
+#                                 [--http-delay 0.05] [--error-rate 0.1] [--json]
+#
+# Needs a display. Without one it re-runs itself under xvfb-run, or against
+# a broadwayd it starts, whichever is installed.
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TOOLS_DIR)
+sys.path.insert(0, os.path.join(TOOLS_DIR, "..", "src"))
+
+import fake_bluetoothctl
+from spotify_standin import SpotifyStandin
+
+# Each step is an action and what the window must show before the next one:
+#   next/previous  the Next/Previous buttons
+#   toggle         the Play/Pause button
+#   phone_next     the track changes on the phone. With bluetoothctl the
+#                  window only notices on its position resync, which runs
+#                  while playing, so the session must be playing here.
+SESSIONS = {
+    "skip": ["next", "next", "previous", "next", "next", "previous"],
+    "phone": ["phone_next", "phone_next", "phone_next"],
+    "toggle": ["toggle", "toggle", "toggle", "toggle"],
+    "mixed": ["next", "toggle", "toggle", "phone_next", "previous", "toggle", "next"],
+}
+# Passed to the window as BLUEDIA_POSITION_RESYNC_INTERVAL; the default 30 s
+# would make every phone_next step wait that long.
+RESYNC_INTERVAL = 2
+# Added to the longest polling interval for the per-step timeout.
+STEP_TIMEOUT_MARGIN = 10
+SETTLE_SECONDS = 0.5
+# The main loop is poked at this interval; a gap longer than STALL_MS means
+# something blocked it.
+PROBE_INTERVAL_MS = 10
+STALL_MS = 50
+BROADWAY_DISPLAY = ":5"
+
+def ensure_display():
+    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY") or os.environ.get("GDK_BACKEND"):
+        return None
+    if shutil.which("xvfb-run"):
+        os.execvp("xvfb-run", ["xvfb-run", "-a", sys.executable] + sys.argv)
+    if shutil.which("broadwayd"):
+        os.environ["GDK_BACKEND"] = "broadway"
+        os.environ["BROADWAY_DISPLAY"] = BROADWAY_DISPLAY
+        daemon = subprocess.Popen(["broadwayd", BROADWAY_DISPLAY], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(0.5)
+        return daemon
+    sys.exit("replay_bench: no display, and neither xvfb-run nor broadwayd is installed")
+
+# Writes the `bluetoothctl` wrapper and the playlist state, and points the
+# caches and Spotify URLs somewhere private. Must run before bluedia is
+# imported, which reads them.
+def prepare_environment(workdir, server, latency, resync_interval):
+    bin_dir = os.path.join(workdir, "bin")
+    os.mkdir(bin_dir)
+    wrapper = os.path.join(bin_dir, "bluetoothctl")
+    with open(wrapper, "w") as file:
+        file.write(f'#!/bin/sh\nexec "{sys.executable}" "{fake_bluetoothctl.__file__}" "$@"\n')
+    os.chmod(wrapper, 0o755)
+    state_path = os.path.join(workdir, "player.json")
+    fake_bluetoothctl.write_state(state_path, {"index": 0, "status": "playing"})
+    log_path = os.path.join(workdir, "bluetoothctl.log")
+    os.environ.update({
+        "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+        "FAKE_BLUETOOTHCTL_STATE": state_path,
+        "FAKE_BLUETOOTHCTL_LATENCY": str(latency),
+        "FAKE_BLUETOOTHCTL_LOG": log_path,
+        "BLUEDIA_BACKEND": "bluetoothctl",
+        "BLUEDIA_POSITION_RESYNC_INTERVAL": str(resync_interval),
+        "BLUEDIA_SPOTIFY_ACCOUNTS_URL": server.url,
+        "BLUEDIA_SPOTIFY_API_URL": server.url,
+        "XDG_CACHE_HOME": os.path.join(workdir, "cache"),
+        "XDG_CONFIG_HOME": os.path.join(workdir, "config"),
+    })
+    return state_path, log_path
+
+class StallProbe:
+    def __init__(self, GLib):
+        self.last = time.monotonic()
+        self.gaps = []
+        GLib.timeout_add(PROBE_INTERVAL_MS, self.tick)
+
+    def tick(self):
+        now = time.monotonic()
+        self.gaps.append((now - self.last) * 1000)
+        self.last = now
+        return True
+
+    def stats(self):
+        stalls = [gap for gap in self.gaps if gap > STALL_MS]
+        return {
+            "stalls": len(stalls),
+            "stall_ms": round(sum(gap - PROBE_INTERVAL_MS for gap in stalls), 1),
+            "max_gap_ms": round(max(self.gaps, default=0), 1),
+        }
+
+def read_memory():
+    memory = {}
+    with open("/proc/self/status") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "VmHWM"):
+                memory[name.lower() + "_kib"] = int(value.split()[0])
+    return memory
+
+def count_log(log_path):
+    spawns = commands = 0
+    if os.path.exists(log_path):
+        with open(log_path) as file:
+            for line in file:
+                kind = line.split()[2]
+                spawns += kind == "spawn"
+                commands += kind == "command"
+    return spawns, commands
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "min_ms": round(min(samples), 1),
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+# Walks the session's play/pause state and refuses phone_next while paused,
+# since nothing would ever notice that track change.
+def check_session(actions):
+    playing = True
+    for number, action in enumerate(actions, 1):
+        if action == "toggle":
+            playing = not playing
+        elif action == "phone_next" and not playing:
+            sys.exit(f"replay_bench: step {number} is phone_next while paused")
+
+class Replay:
+    def __init__(self, bluedia, state_path, titles):
+        self.bluedia = bluedia
+        self.GLib = bluedia.GLib
+        self.context = self.GLib.MainContext.default()
+        self.state_path = state_path
+        self.titles = titles
+        self.index = 0
+        self.playing = True
+        self.latencies = {}
+        self.timeouts = []
+        # Longer than any interval at which the window polls the fake.
+        self.step_timeout = max(
+            bluedia.POSITION_RESYNC_INTERVAL, bluedia.BLUETOOTH_UPDATE_INTERVAL
+        ) + STEP_TIMEOUT_MARGIN
+        self.probe = StallProbe(self.GLib)
+        self.window = bluedia.BluetoothControlWindow()
+        self.window.show_all()
+
+    def run_until(self, predicate, timeout=None):
+        deadline = time.monotonic() + (timeout or self.step_timeout)
+        while not predicate():
+            if time.monotonic() > deadline:
+                return False
+            self.context.iteration(True)
+        return True
+
+    def settle(self, seconds=SETTLE_SECONDS):
+        deadline = time.monotonic() + seconds
+        self.run_until(lambda: time.monotonic() >= deadline, seconds + 1)
+
+    def shows_title(self):
+        view = self.window.renderer.view
+        title = self.titles[self.index % len(self.titles)]
+        return view is not None and view.art is not None and view.art[2] == title
+
+    def shows_art(self):
+        pixbuf = self.window.album_art_pixbuf
+        return pixbuf is not None and pixbuf not in self.window.fallback_pixbufs.values() \
+            and not self.window.art_pipeline.busy()
+
+    def measure(self, name, start, predicate):
+        if self.run_until(predicate):
+            self.latencies.setdefault(name, []).append((time.monotonic() - start) * 1000)
+        else:
+            self.timeouts.append(name)
+
+    def step(self, action):
+        start = time.monotonic()
+        if action in ("next", "previous", "phone_next"):
+            previous_art = self.window.album_art_pixbuf
+            self.index += -1 if action == "previous" else 1
+            if action == "phone_next":
+                state = fake_bluetoothctl.read_state(self.state_path)
+                state["index"] += 1
+                fake_bluetoothctl.write_state(self.state_path, state)
+            else:
+                getattr(self.window, f"on_{action}_clicked")(None)
+            self.measure(f"{action}_to_title", start, self.shows_title)
+            self.measure(f"{action}_to_art", start,
+                         lambda: self.window.album_art_pixbuf is not previous_art and self.shows_art())
+        elif action == "toggle":
+            self.playing = not self.playing
+            self.window.on_play_pause_clicked(None)
+            self.measure("toggle_to_button", start, lambda: self.window.renderer.view.playing == self.playing)
+        self.settle()
+
+    def run(self, actions):
+        start = time.monotonic()
+        self.measure("startup_to_title", start, self.shows_title)
+        self.measure("startup_to_art", start, self.shows_art)
+        self.settle()
+        for action in actions:
+            self.step(action)
+        self.window.shutdown()
+        self.window.destroy()
+        return {
+            "latency": {name: summarize(samples) for name, samples in self.latencies.items()},
+            "timeouts": self.timeouts,
+            "main_loop": self.probe.stats(),
+        }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--session", choices=sorted(SESSIONS), default="mixed")
+    parser.add_argument("--rounds", type=int, default=1, help="repeat the session this many times")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds fake bluetoothctl takes per command")
+    parser.add_argument("--http-delay", type=float, default=0.05, help="seconds the stand-in adds to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP requests answered with 503")
+    parser.add_argument("--resync-interval", type=int, default=RESYNC_INTERVAL,
+                        help="seconds between the window's position resyncs, which pick up phone_next")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+    actions = SESSIONS[args.session] * args.rounds
+    check_session(actions)
+
+    broadway = ensure_display()
+    server = SpotifyStandin(delay=args.http_delay, error_rate=args.error_rate).start()
+    with tempfile.TemporaryDirectory() as workdir:
+        state_path, log_path = prepare_environment(workdir, server, args.latency, args.resync_interval)
+        import bluedia
+        titles = [bluedia.parse_player_output(text).title for text in fake_bluetoothctl.load_playlist()]
+        replay = Replay(bluedia, state_path, titles)
+        report = replay.run(actions)
+        bluedia.bluetooth_session.close()
+        spawns, commands = count_log(log_path)
+    server.stop()
+    if broadway is not None:
+        broadway.terminate()
+
+    report.update({
+        "session": args.session,
+        "subprocesses": spawns,
+        "bluetoothctl_commands": commands,
+        "http": {name: server.counters.get(name, 0) for name in ("token", "search", "image", "connections", "errors")},
+        "memory": read_memory(),
+        "stages": bluedia.stage_stats.snapshot()["stages"],
+    })
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"session {args.session} x{args.rounds}, bluetoothctl latency {args.latency * 1000:.0f} ms, "
+          f"HTTP delay {args.http_delay * 1000:.0f} ms")
+    print(f"{'latency':<22}{'count':>7}{'min ms':>10}{'median ms':>11}{'max ms':>10}")
+    for name, summary in sorted(report["latency"].items()):
+        print(f"{name:<22}{summary['count']:>7}{summary['min_ms']:>10.1f}{summary['median_ms']:>11.1f}{summary['max_ms']:>10.1f}")
+    if report["timeouts"]:
+        print("timed out:", ", ".join(report["timeouts"]))
+    print(f"subprocesses {spawns}, bluetoothctl commands {commands}")
+    print("http", report["http"])
+    print("main loop", report["main_loop"])
+    print("memory", report["memory"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Local stand-in for the Spotify accounts, search and image endpoints.
+#
+#   python3 tools/spotify_standin.py --port 8765 --delay 0.05 --error-rate 0.1
+#   BLUEDIA_SPOTIFY_ACCOUNTS_URL=http://127.0.0.1:8765 \
+#   BLUEDIA_SPOTIFY_API_URL=http://127.0.0.1:8765 python3 src/bluedia.py
+#
+# Every endpoint can be slowed down or made to fail with 503 + Retry-After.
+# Search responses carry an ETag and answer If-None-Match with 304. Images
+# are the bundled placeholder, so they decode like a real cover. Counters
+# for requests and accepted connections show whether keep-alive is working.
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "no-album-art.png")
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms) on every keep-alive request.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, content_type, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def inject(self, endpoint):
+        self.server.count(endpoint)
+        time.sleep(self.server.delays.get(endpoint, self.server.delay))
+        if random.random() < self.server.error_rate:
+            self.server.count("errors")
+            self.send_body(503, b"", "text/plain", [("Retry-After", str(self.server.retry_after))])
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if urlparse(self.path).path != "/api/token":
+            self.send_body(404, b"", "text/plain")
+            return
+        if self.inject("token"):
+            return
+        body = json.dumps({"access_token": "standin-token", "token_type": "Bearer", "expires_in": 3600})
+        self.send_body(200, body.encode(), "application/json")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/v1/search":
+            if self.inject("search"):
+                return
+            query = parse_qs(url.query).get("q", [""])[0]
+            if query in self.server.misses:
+                items = []
+            else:
+                image = hashlib.sha1(query.encode()).hexdigest()
+                base = f"http://{self.headers.get('Host')}"
+                items = [{"name": query, "album": {"images": [{"url": f"{base}/images/{image}.png"}]}}]
+            body = json.dumps({"tracks": {"items": items}}).encode()
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.server.count("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_body(200, body, "application/json", [("ETag", etag)])
+        elif url.path.startswith("/images/"):
+            if self.inject("image"):
+                return
+            self.send_body(200, self.server.image, "image/png")
+        else:
+            self.send_body(404, b"", "text/plain")
+
+class SpotifyStandin(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, delay=0.0, delays=None, error_rate=0.0, retry_after=0,
+                 misses=(), verbose=False):
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.delay = delay
+        self.delays = delays or {}
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.misses = set(misses)
+        self.verbose = verbose
+        with open(IMAGE_PATH, "rb") as file:
+            self.image = file.read()
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+    server = SpotifyStandin(args.port, args.delay, error_rate=args.error_rate,
+                            retry_after=args.retry_after, verbose=True)
+    print(f"export BLUEDIA_SPOTIFY_ACCOUNTS_URL={server.url} BLUEDIA_SPOTIFY_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.counters))
+
+if __name__ == "__main__":
+    main()